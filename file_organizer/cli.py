@@ -8,7 +8,10 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt, Confirm
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import (
+    Progress, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn,
+    DownloadColumn, TransferSpeedColumn, TimeRemainingColumn,
+)
 from rich.tree import Tree
 
 from file_organizer.organizer import FileOrganizer
@@ -16,10 +19,41 @@ from file_organizer.organizer import FileOrganizer
 console = Console()
 
 class FileOrganizerCLI:
-    def __init__(self):
-        """Initialize the CLI interface."""
+    def __init__(self, throttle=None, shard_by=None, max_entries=None,
+                 include_organized=False):
+        """
+        Initialize the CLI interface.
+        
+        Args:
+            throttle (IOThrottle): Optional limiter passed to the organizer
+            shard_by (str): Optional fan-out layout passed to the organizer
+            max_entries (int): Entry limit per sharded directory
+            include_organized (bool): Also check files already in category
+                folders for duplicates
+        """
         self.console = Console()
         self.organizer = None
+        self.throttle = throttle
+        self.shard_by = shard_by
+        self.max_entries = max_entries
+        self.include_organized = include_organized
+        self.progress = None  # Progress display receiving organizer events
+        self.progress_task = None
+        self.progress_offset = 0  # Work completed by earlier calls in a stage
+    
+    def handle_progress(self, event):
+        """
+        Update the active progress bar from an organizer event.
+        
+        Args:
+            event (ProgressEvent): Progress event from the organizer
+        """
+        if self.progress is None:
+            return
+            
+        if event.total is not None and event.stage == "hash":
+            self.progress.update(self.progress_task, total=event.total)
+        self.progress.update(self.progress_task, completed=self.progress_offset + event.completed)
     
     def select_directory(self):
         """
@@ -146,6 +180,47 @@ class FileOrganizerCLI:
                 
         return files_to_remove
     
+    def confirm_resharding(self, categories):
+        """
+        Ask whether existing files above the shard levels should be moved.
+        
+        Args:
+            categories (dict): Categories confirmed for organization
+            
+        Returns:
+            set: Categories whose existing files should be moved into shards
+        """
+        reshard = set()
+        
+        if not self.organizer.shard_by:
+            return reshard
+            
+        for category in categories:
+            unsharded = self.organizer.find_unsharded_files(category)
+            if not unsharded:
+                continue
+                
+            if Confirm.ask(
+                f"The [blue]{category}[/blue] folder already has {len(unsharded)} files "
+                f"outside its shards. Move them into shards too?",
+                default=False
+            ):
+                reshard.add(category)
+                
+        return reshard
+    
+    def track(self, progress, task_id=None):
+        """
+        Route organizer progress events to a progress bar.
+        
+        Args:
+            progress (Progress): Progress display, or None to stop tracking
+            task_id (TaskID): Task to update
+        """
+        self.progress = progress
+        self.progress_task = task_id
+        self.progress_offset = 0
+    
     def run(self):
         """
         Run the file organizer CLI.
@@ -153,7 +228,13 @@ class FileOrganizerCLI:
         try:
             # Step 1: Select directory
             dir_path = self.select_directory()
-            self.organizer = FileOrganizer(dir_path)
+            self.organizer = FileOrganizer(
+                dir_path,
+                throttle=self.throttle,
+                shard_by=self.shard_by,
+                max_entries=self.max_entries
+            )
+            self.organizer.add_listener(self.handle_progress)
             
             # Check if this is a project directory before scanning
             if self.organizer.detect_project_structure():
@@ -180,10 +261,12 @@ class FileOrganizerCLI:
             with Progress(
                 SpinnerColumn(),
                 TextColumn("[bold blue]Scanning directory...[/bold blue]"),
+                TextColumn("{task.completed} files"),
                 transient=True
             ) as progress:
-                progress.add_task("scan", total=None)
+                self.track(progress, progress.add_task("scan", total=None))
                 file_map = self.organizer.scan_directory()
+                self.track(None)
                 
             # Step 3: Display and confirm file organization
             self.display_file_map(file_map)
@@ -202,10 +285,17 @@ class FileOrganizerCLI:
             with Progress(
                 SpinnerColumn(),
                 TextColumn("[bold blue]Checking for duplicates...[/bold blue]"),
+                BarColumn(),
+                DownloadColumn(),
+                TransferSpeedColumn(),
+                TimeRemainingColumn(),
                 transient=True
             ) as progress:
-                progress.add_task("duplicates", total=None)
-                duplicate_groups = self.organizer.find_duplicates()
+                self.track(progress, progress.add_task("duplicates", total=None))
+                duplicate_groups = self.organizer.find_duplicates(
+                    include_organized=self.include_organized
+                )
+                self.track(None)
                 
             # Step 5: Handle duplicates
             files_to_remove = self.display_duplicates(duplicate_groups)
@@ -220,20 +310,51 @@ class FileOrganizerCLI:
                     removed = self.organizer.remove_duplicates(files_to_remove)
                     
                 self.console.print(f"[green]Successfully removed {len(removed)} duplicate files.[/green]")
+                
+                # Removed files no longer need to be organized
+                removed = set(removed)
+                confirmed_categories = {
+                    category: [f for f in files if f not in removed]
+                    for category, files in confirmed_categories.items()
+                }
             
             # Step 6: Organize files
+            reshard = self.confirm_resharding(confirmed_categories)
+            
+            # Plan every move first so the progress total matches the real work
+            planned_moves = {
+                category: self.organizer.organize_files(
+                    category, files, reshard=category in reshard
+                )
+                for category, files in confirmed_categories.items()
+            }
+            total_moves = sum(len(moves) for moves in planned_moves.values())
             with Progress(
                 SpinnerColumn(),
                 TextColumn("[bold blue]Organizing files...[/bold blue]"),
+                BarColumn(),
+                MofNCompleteColumn(),
+                TimeRemainingColumn(),
                 transient=True
             ) as progress:
-                progress.add_task("organize", total=None)
+                self.track(progress, progress.add_task("organize", total=total_moves))
                 
-                for category, files in confirmed_categories.items():
-                    moves = self.organizer.organize_files(category, files)
+                for category, moves in planned_moves.items():
                     successful = self.organizer.execute_move(moves)
+                    self.progress_offset += len(moves)
+                    
+                    # Existing files moved between shards are reported separately
+                    new_files = set(confirmed_categories[category])
+                    moved = sum(1 for src, dst in successful if src in new_files)
+                    progress.console.print(f"[green]Moved {moved} files to {category} folder.[/green]")
+                    
+                    relocated = len(successful) - moved
+                    if relocated:
+                        progress.console.print(
+                            f"[green]Moved {relocated} existing files into shards of {category} folder.[/green]"
+                        )
                     
-                    self.console.print(f"[green]Moved {len(successful)} files to {category} folder.[/green]")
+                self.track(None)
             
             # Final message with statistics
             stats = self.organizer.get_stats()
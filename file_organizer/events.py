@@ -0,0 +1,59 @@
+"""
+Progress events emitted by FileOrganizer while it scans, hashes and moves files.
+"""
+
+import time
+from collections import namedtuple
+
+# A snapshot of progress for one stage ("scan", "hash" or "move").
+# total is None when it is not known up front; unit is "files" or "bytes".
+ProgressEvent = namedtuple("ProgressEvent", ["stage", "completed", "total", "unit", "done"])
+
+
+class ProgressReporter:
+    def __init__(self, listeners, stage, total=None, unit="files", interval=0.1):
+        """
+        Initialize the ProgressReporter.
+
+        Args:
+            listeners (list): Callables receiving ProgressEvent objects
+            stage (str): Stage name reported in events
+            total (int): Total amount of work, None if unknown
+            unit (str): Unit of completed and total ("files" or "bytes")
+            interval (float): Minimum seconds between emitted events
+        """
+        self.listeners = listeners
+        self.stage = stage
+        self.total = total
+        self.unit = unit
+        self.interval = interval
+        self.completed = 0
+        self.next_emit = time.monotonic()
+
+    def advance(self, amount=1):
+        """
+        Record completed work, emitting an event at most once per interval.
+
+        Args:
+            amount (int): Amount of work completed since the last call
+        """
+        self.completed += amount
+        now = time.monotonic()
+        if now >= self.next_emit:
+            self.next_emit = now + self.interval
+            self.emit(False)
+
+    def finish(self):
+        """Emit the final event for the stage."""
+        self.emit(True)
+
+    def emit(self, done):
+        """
+        Send the current progress to all listeners.
+
+        Args:
+            done (bool): Whether the stage is complete
+        """
+        event = ProgressEvent(self.stage, self.completed, self.total, self.unit, done)
+        for listener in self.listeners:
+            listener(event)
@@ -6,7 +6,8 @@ import argparse
 import sys
 from pathlib import Path
 from file_organizer.cli import FileOrganizerCLI
-from file_organizer.organizer import FileOrganizer
+from file_organizer.organizer import FileOrganizer, SHARD_LAYOUTS, validate_shard_options
+from file_organizer.throttle import IOThrottle, lower_io_priority, parse_bandwidth
 
 def parse_args():
     """Parse command line arguments."""
@@ -14,12 +15,45 @@ def parse_args():
     parser.add_argument("--dir", "-d", type=str, help="Directory to organize")
     parser.add_argument("--exclude", "-e", action="append", help="Patterns to exclude (can be used multiple times)")
     parser.add_argument("--no-project-detection", action="store_true", help="Disable project detection")
+    parser.add_argument("--max-bandwidth", type=str, help="Limit disk I/O for hashing and moving, e.g. 20M (bytes per second)")
+    parser.add_argument("--low-priority", action="store_true", help="Run with lowered CPU and I/O priority")
+    parser.add_argument("--adaptive-backoff", action="store_true", help="Slow down when disk read latency rises")
+    parser.add_argument("--shard-by", choices=SHARD_LAYOUTS, help="Fan out category folders into subdirectories")
+    parser.add_argument("--max-entries", type=int, help="Maximum entries per sharded directory before splitting it deeper (requires --shard-by)")
+    parser.add_argument("--include-organized", action="store_true", help="Also check files already in category folders for duplicates")
     return parser.parse_args()
 
 def main():
     """Run the file organizer CLI."""
     args = parse_args()
-    cli = FileOrganizerCLI()
+    
+    max_bandwidth = None
+    if args.max_bandwidth:
+        try:
+            max_bandwidth = parse_bandwidth(args.max_bandwidth)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+    
+    try:
+        validate_shard_options(args.shard_by, args.max_entries)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    
+    if args.low_priority:
+        lower_io_priority()
+    
+    throttle = None
+    if max_bandwidth or args.adaptive_backoff:
+        throttle = IOThrottle(max_bandwidth=max_bandwidth, adaptive=args.adaptive_backoff)
+    
+    cli = FileOrganizerCLI(
+        throttle=throttle,
+        shard_by=args.shard_by,
+        max_entries=args.max_entries,
+        include_organized=args.include_organized
+    )
     
     # If directory is specified, use it
     if args.dir:
@@ -29,7 +63,13 @@ def main():
             sys.exit(1)
             
         # Create organizer with exclusions
-        cli.organizer = FileOrganizer(args.dir, exclusions=args.exclude)
+        cli.organizer = FileOrganizer(
+            args.dir,
+            exclusions=args.exclude,
+            throttle=throttle,
+            shard_by=args.shard_by,
+            max_entries=args.max_entries
+        )
         
         # Disable project detection if requested
         if args.no_project_detection:
@@ -5,25 +5,119 @@ Core functionality for organizing files and handling duplicates.
 import os
 import shutil
 import hashlib
+import string
+from datetime import datetime
 from pathlib import Path
 
 from file_organizer.categories import get_category
+from file_organizer.events import ProgressReporter
+
+# Fan-out layouts for category folders
+SHARD_LAYOUTS = ("date", "name", "hash")
+
+# Largest number of subdirectories one shard level can hold per layout
+# (12 months or 31 days, 26 letters + 10 digits + "_", 256 hex pairs)
+SHARD_FAN_OUT = {"date": 31, "name": 37, "hash": 256}
+
+# Characters used for name prefixes; everything else maps to "_"
+NAME_SHARD_CHARS = set(string.ascii_lowercase + string.digits)
+
+# Deepest name prefix level; further levels use single hex digits of the
+# name hash so that long shared prefixes (IMG_, DSC_) can still be split
+MAX_NAME_SHARD_DEPTH = 16
+
+
+def validate_shard_options(shard_by, max_entries):
+    """
+    Check that a shard layout and entry limit can be used together.
+    
+    Args:
+        shard_by (str): Fan-out layout, or None
+        max_entries (int): Entry limit per sharded directory, or None
+        
+    Raises:
+        ValueError: If the options are invalid
+    """
+    if shard_by is not None and shard_by not in SHARD_LAYOUTS:
+        raise ValueError(f"Unknown shard layout: {shard_by}")
+        
+    if max_entries is None:
+        return
+        
+    if shard_by is None:
+        raise ValueError("max_entries can only be used together with shard_by")
+    if max_entries <= 0:
+        raise ValueError(f"max_entries must be positive: {max_entries}")
+        
+    # A split directory holds one subdirectory per key, which must fit too
+    if max_entries < SHARD_FAN_OUT[shard_by]:
+        raise ValueError(
+            f"max_entries must be at least {SHARD_FAN_OUT[shard_by]} "
+            f"for {shard_by} sharding: {max_entries}"
+        )
 
 class FileOrganizer:
-    def __init__(self, source_dir, exclusions=None):
+    def __init__(self, source_dir, exclusions=None, throttle=None,
+                 shard_by=None, max_entries=None):
         """
         Initialize the FileOrganizer.
         
         Args:
             source_dir (str): Directory to organize
             exclusions (list): Patterns to exclude from organization
+            throttle (IOThrottle): Optional limiter for hashing and move I/O
+            shard_by (str): Fan-out layout for category folders
+                ("date", "name" or "hash"), None for flat folders
+            max_entries (int): Maximum entries per sharded directory; a full
+                directory is split one level deeper
         """
+        validate_shard_options(shard_by, max_entries)
+            
         self.source_dir = Path(source_dir)
         self.file_map = {}  # Maps categories to files
         self.duplicates = []  # List of duplicate files found
         self.is_project_dir = False  # Flag for project directories
         self.project_files = set()  # Project-related files to not move
         self.exclusions = exclusions or []  # Exclusion patterns
+        self.throttle = throttle  # I/O throttle, None for full speed
+        self.shard_by = shard_by  # Fan-out layout, None for flat folders
+        self.max_entries = max_entries  # Entry limit per sharded directory
+        self.listeners = []  # Callbacks receiving ProgressEvent objects
+        
+    def add_listener(self, callback):
+        """
+        Subscribe to progress events.
+        
+        Args:
+            callback (callable): Called with a ProgressEvent during scanning,
+                hashing and moving
+        """
+        self.listeners.append(callback)
+        
+    def remove_listener(self, callback):
+        """
+        Unsubscribe from progress events.
+        
+        Args:
+            callback (callable): Previously added callback
+        """
+        self.listeners.remove(callback)
+        
+    def create_reporter(self, stage, total=None, unit="files"):
+        """
+        Create a progress reporter for a stage.
+        
+        Args:
+            stage (str): Stage name ("scan", "hash" or "move")
+            total (int): Total amount of work, None if unknown
+            unit (str): Unit of progress ("files" or "bytes")
+            
+        Returns:
+            ProgressReporter: Reporter, or None when nobody is listening
+        """
+        if not self.listeners:
+            return None
+        return ProgressReporter(self.listeners, stage, total=total, unit=unit)
         
     def detect_project_structure(self):
         """
@@ -137,6 +231,8 @@ class FileOrganizer:
                     "Archives", "Programming", "Misc", "Executables", 
                     "Fonts", "E-books", "Design"}
         
+        reporter = self.create_reporter("scan")
+        
         try:
             for item in self.source_dir.iterdir():
                 # Skip directories and hidden files
@@ -155,68 +251,346 @@ class FileOrganizer:
                             self.file_map[category] = []
                             
                         self.file_map[category].append(item)
+                        
+                        if reporter is not None:
+                            reporter.advance()
                     except Exception as e:
                         print(f"Error processing file {item}: {e}")
         except PermissionError:
             print(f"Permission denied when accessing {self.source_dir}")
             
+        if reporter is not None:
+            reporter.finish()
+            
         return self.file_map
     
-    def get_file_hash(self, file_path):
+    def get_file_hash(self, file_path, reporter=None):
         """
         Calculate SHA-256 hash of a file.
         
         Args:
             file_path (Path): Path to the file
+            reporter (ProgressReporter): Optional reporter advanced by bytes read
             
         Returns:
             str: Hex digest of file hash
         """
         h = hashlib.sha256()
         
+        # Reads go through the throttle when one is configured
+        if self.throttle is not None:
+            read = self.throttle.read
+        else:
+            read = lambda f, size: f.read(size)
+        
         # Read file in chunks to handle large files
         with open(file_path, 'rb') as f:
-            chunk = f.read(65536)  # 64kb chunks
+            chunk = read(f, 65536)  # 64kb chunks
             while chunk:
                 h.update(chunk)
-                chunk = f.read(65536)
+                if reporter is not None:
+                    reporter.advance(len(chunk))
+                chunk = read(f, 65536)
                 
         return h.hexdigest()
     
-    def find_duplicates(self):
+    def find_duplicates(self, include_organized=False):
         """
         Find duplicate files based on content hash.
         
+        Args:
+            include_organized (bool): Also compare against files already in
+                the category folders, including sharded subdirectories
+        
         Returns:
             list: Groups of duplicate files
         """
         self.duplicates = []
         hash_map = {}
+        to_hash = []
+        
+        # Already organized files go first so they are the copy kept
+        if include_organized:
+            sizes = {f.stat().st_size for files in self.file_map.values() for f in files}
+            for category in self.file_map:
+                for file_path in self.iter_category_files(category):
+                    # Only hash files that could match a new file
+                    if file_path.stat().st_size in sizes:
+                        to_hash.append(file_path)
         
         # Scan all files in all categories
         for category, files in self.file_map.items():
-            for file_path in files:
-                file_hash = self.get_file_hash(file_path)
+            to_hash.extend(files)
+            
+        reporter = None
+        if self.listeners:
+            total_bytes = sum(f.stat().st_size for f in to_hash)
+            reporter = self.create_reporter("hash", total=total_bytes, unit="bytes")
+        
+        for file_path in to_hash:
+            file_hash = self.get_file_hash(file_path, reporter)
+            
+            if file_hash in hash_map:
+                hash_map[file_hash].append(file_path)
+            else:
+                hash_map[file_hash] = [file_path]
                 
-                if file_hash in hash_map:
-                    hash_map[file_hash].append(file_path)
-                else:
-                    hash_map[file_hash] = [file_path]
+        if reporter is not None:
+            reporter.finish()
         
         # Extract duplicates (files with the same hash)
+        new_files = {f for files in self.file_map.values() for f in files}
         for file_hash, files in hash_map.items():
+            new = [f for f in files if f in new_files]
+            if not new:
+                # Only organized files, which are never offered for removal
+                continue
+            if len(new) < len(files):
+                # Keep a single organized copy ahead of the new files
+                files = [f for f in files if f not in new_files][:1] + new
             if len(files) > 1:
                 self.duplicates.append(files)
                 
         return self.duplicates
     
-    def organize_files(self, category, files_to_move):
+    def iter_category_files(self, category):
+        """
+        Yield files already stored in a category folder.
+        
+        Walks shard subdirectories so that sharded and flat layouts are
+        handled alike.
+        
+        Args:
+            category (str): Category name
+            
+        Yields:
+            Path: Files in the category folder
+        """
+        category_dir = self.source_dir / category
+        for root, dirs, files in os.walk(category_dir):
+            for name in files:
+                if not name.startswith('.'):
+                    yield Path(root) / name
+    
+    def find_unsharded_files(self, category):
+        """
+        Find files in a category folder that sit above the shard levels.
+        
+        These are typically files from before sharding was turned on, such
+        as a flat category folder. They are only moved when resharding is
+        requested explicitly.
+        
+        Args:
+            category (str): Category name
+            
+        Returns:
+            list: Files to move into shards when resharding
+        """
+        min_depth = 2 if self.shard_by == "date" else 1
+        unsharded = []
+        pending = [(self.source_dir / category, 0)]
+        
+        while pending:
+            directory, depth = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for item in entries:
+                        if item.is_dir():
+                            if depth + 1 < min_depth:
+                                pending.append((Path(item.path), depth + 1))
+                        elif item.is_file() and not item.name.startswith('.'):
+                            unsharded.append(Path(item.path))
+            except (FileNotFoundError, NotADirectoryError):
+                pass
+                
+        return unsharded
+    
+    def get_shard_levels(self, file_path, name=None):
+        """
+        Get the candidate shard subdirectories for a file.
+        
+        Args:
+            file_path (Path): File to place
+            name (str): Name the file will have, defaults to its current name
+            
+        Returns:
+            tuple: (levels, min_depth) where levels lists the subdirectory
+                names from shallowest to deepest
+        """
+        name = name or file_path.name
+        
+        if self.shard_by == "date":
+            modified = datetime.fromtimestamp(file_path.stat().st_mtime)
+            levels = [f"{modified.year:04d}", f"{modified.month:02d}", f"{modified.day:02d}"]
+            return levels, 2
+            
+        digest = hashlib.sha1(name.encode("utf-8", "surrogateescape")).hexdigest()
+        
+        if self.shard_by == "name":
+            stem = Path(name).stem.lower()
+            key = "".join(c if c in NAME_SHARD_CHARS else "_" for c in stem) or "_"
+            levels = [key[:i] for i in range(1, min(len(key), MAX_NAME_SHARD_DEPTH) + 1)]
+            return levels + list(digest[:3]), 1
+            
+        return [digest[0:2], digest[2:4], digest[4:6]], 1
+    
+    def load_shard_dir(self, directory, shards):
+        """
+        Get the planning state of a shard directory, reading it on first use.
+        
+        Args:
+            directory (Path): Shard directory
+            shards (dict): Planning state of directories seen so far
+            
+        Returns:
+            dict: "files" (maps names to the files that will have them),
+                "dirs" (subdirectory names), "fixed" (other entries),
+                "split" (holds only subdirectories) and "warned" (over the
+                limit warning printed)
+        """
+        if directory not in shards:
+            entry = {"files": {}, "dirs": set(), "fixed": 0, "split": False, "warned": False}
+            try:
+                with os.scandir(directory) as entries:
+                    for item in entries:
+                        if item.is_dir():
+                            entry["dirs"].add(item.name)
+                        elif item.is_file() and not item.name.startswith('.'):
+                            entry["files"][item.name] = Path(item.path)
+                        else:
+                            entry["fixed"] += 1
+            except (FileNotFoundError, NotADirectoryError):
+                pass
+            shards[directory] = entry
+        return shards[directory]
+    
+    def place_in_shard(self, category_dir, file_path, shards, name):
+        """
+        Plan the shard directory for a file under a given name.
+        
+        Files are placed in leaf directories. When a leaf reaches max_entries
+        it is split: its files move one level deeper and it keeps only
+        subdirectories, so every file name has a single possible location.
+        At the deepest level the limit can no longer be kept and a warning
+        is printed.
+        
+        Args:
+            category_dir (Path): Category folder
+            file_path (Path): File to place
+            shards (dict): Planning state of directories seen so far
+            name (str): Name the file will have
+            
+        Returns:
+            bool: Whether the file was placed, False if the name is taken
+        """
+        levels, min_depth = self.get_shard_levels(file_path, name)
+        directory = category_dir
+        depth = 0
+        
+        while True:
+            entry = self.load_shard_dir(directory, shards)
+            is_leaf = depth == len(levels) or (
+                depth >= min_depth and not entry["dirs"] and not entry["split"]
+            )
+            
+            if is_leaf:
+                if name in entry["files"] or name in entry["dirs"]:
+                    return False
+                    
+                count = len(entry["files"]) + len(entry["dirs"]) + entry["fixed"]
+                if not self.max_entries or count < self.max_entries:
+                    entry["files"][name] = file_path
+                    return True
+                if depth == len(levels):
+                    if not entry["warned"]:
+                        entry["warned"] = True
+                        print(f"Warning: {directory} exceeds {self.max_entries} entries "
+                              f"and cannot be sharded deeper")
+                    entry["files"][name] = file_path
+                    return True
+                    
+                # The leaf is full: split it, moving its files one level deeper
+                entry["split"] = True
+                files, entry["files"] = entry["files"], {}
+                for moved_name, moved in files.items():
+                    self.plan_file(category_dir, moved, shards, moved_name)
+                    
+            entry["dirs"].add(levels[depth])
+            directory = directory / levels[depth]
+            depth += 1
+    
+    def plan_file(self, category_dir, file_path, shards, name=None):
+        """
+        Plan the shard directory for a file, renaming it on name collisions.
+        
+        A renamed file is placed in the shard of its new name, so a name
+        keeps a single possible location.
+        
+        Args:
+            category_dir (Path): Category folder
+            file_path (Path): File to place
+            shards (dict): Planning state of directories seen so far
+            name (str): Name to use, defaults to the file's current name
+        """
+        name = name or file_path.name
+        stem, suffix = Path(name).stem, Path(name).suffix
+        
+        # Add a counter to the filename, like execute_move does
+        candidate = name
+        counter = 0
+        while not self.place_in_shard(category_dir, file_path, shards, candidate):
+            counter += 1
+            candidate = f"{stem}_{counter}{suffix}"
+    
+    def plan_shard_moves(self, category_dir, files_to_move, existing=()):
+        """
+        Plan moves of new files into a sharded category folder.
+        
+        Files already in the folder are included when a split moves them
+        to a deeper level.
+        
+        Args:
+            category_dir (Path): Category folder
+            files_to_move (list): List of Path objects to move
+            existing (list): Files already in the category folder to move
+                into shards as well
+            
+        Returns:
+            list: List of (source, destination) paths
+        """
+        shards = {}
+        
+        # Existing files leave their current directory and are placed again
+        for file_path in existing:
+            self.load_shard_dir(file_path.parent, shards)["files"].pop(file_path.name, None)
+            self.plan_file(category_dir, file_path, shards)
+            
+        for file_path in files_to_move:
+            self.plan_file(category_dir, file_path, shards)
+            
+        new_files = set(files_to_move)
+        relocated = []
+        destinations = {}
+        for directory, entry in shards.items():
+            for name, file_path in entry["files"].items():
+                dest_path = directory / name
+                if file_path in new_files:
+                    destinations[file_path] = dest_path
+                elif file_path != dest_path:
+                    relocated.append((file_path, dest_path))
+                    
+        # Relocations first so that split directories are emptied early
+        return relocated + [(f, destinations[f]) for f in files_to_move]
+    
+    def organize_files(self, category, files_to_move, reshard=False):
         """
         Move files to their category folder.
         
         Args:
             category (str): Category name
             files_to_move (list): List of Path objects to move
+            reshard (bool): Also move existing files found by
+                find_unsharded_files into shards
             
         Returns:
             list: List of (source, destination) paths
@@ -228,6 +602,13 @@ class FileOrganizer:
         if not category_dir.exists():
             category_dir.mkdir()
             
+        # Files removed in the meantime (e.g. duplicates) are not moved
+        files_to_move = [f for f in files_to_move if f.exists()]
+        
+        if self.shard_by:
+            existing = self.find_unsharded_files(category) if reshard else []
+            return self.plan_shard_moves(category_dir, files_to_move, existing)
+            
         # Move files to category directory
         for file_path in files_to_move:
             dest_path = category_dir / file_path.name
@@ -269,9 +650,14 @@ class FileOrganizer:
             list: Successfully moved files
         """
         successful_moves = []
+        reporter = self.create_reporter("move", total=len(moves))
         
         for src, dst in moves:
             try:
+                # Sharded destinations may need their subdirectories created
+                if not dst.parent.exists():
+                    dst.parent.mkdir(parents=True)
+                
                 # Handle case where destination already exists
                 if dst.exists():
                     # Add a counter to the filename
@@ -284,12 +670,21 @@ class FileOrganizer:
                             break
                         counter += 1
                 
-                # Move the file
-                shutil.move(str(src), str(dst))
+                # Move the file, copying under the throttle across filesystems
+                if self.throttle is not None:
+                    shutil.move(str(src), str(dst), copy_function=self.throttle.copy_file)
+                else:
+                    shutil.move(str(src), str(dst))
                 successful_moves.append((src, dst))
             except Exception as e:
                 print(f"Error moving {src} to {dst}: {e}")
                 
+            if reporter is not None:
+                reporter.advance()
+                
+        if reporter is not None:
+            reporter.finish()
+            
         return successful_moves
     
     def get_stats(self):
@@ -0,0 +1,236 @@
+"""
+I/O throttling and priority control for hashing and moving files.
+"""
+
+import os
+import sys
+import time
+import shutil
+import threading
+
+# Size suffixes accepted by parse_bandwidth
+SIZE_UNITS = {
+    "": 1,
+    "K": 1024,
+    "M": 1024 ** 2,
+    "G": 1024 ** 3,
+}
+
+# Linux ioprio_set constants (see linux/ioprio.h)
+IOPRIO_WHO_PROCESS = 1
+IOPRIO_CLASS_IDLE = 3
+IOPRIO_CLASS_SHIFT = 13
+
+# ioprio_set syscall numbers per architecture
+IOPRIO_SET_SYSCALLS = {
+    "x86_64": 251,
+    "i386": 289,
+    "i686": 289,
+    "aarch64": 30,
+    "armv7l": 314,
+}
+
+# Reads used to seed the baseline latency before backoff starts
+LATENCY_SEED_SAMPLES = 8
+
+
+def parse_bandwidth(value):
+    """
+    Parse a bandwidth limit such as "512K", "10M" or "1G" into bytes per second.
+
+    Args:
+        value (str): Bandwidth with an optional K/M/G suffix (binary units)
+
+    Returns:
+        int: Bytes per second
+
+    Raises:
+        ValueError: If the value cannot be parsed or is not positive
+    """
+    text = str(value).strip().upper()
+    for suffix in ("/S", "B"):
+        if text.endswith(suffix):
+            text = text[:-len(suffix)]
+
+    unit = ""
+    if text and text[-1] in SIZE_UNITS:
+        unit = text[-1]
+        text = text[:-1]
+
+    try:
+        rate = int(float(text) * SIZE_UNITS[unit])
+    except (ValueError, OverflowError):
+        raise ValueError(f"Invalid bandwidth: {value}")
+
+    if rate <= 0:
+        raise ValueError(f"Bandwidth must be positive: {value}")
+
+    return rate
+
+
+def lower_io_priority():
+    """
+    Lower the CPU and I/O priority of the calling thread.
+
+    Uses nice() everywhere it is available and ioprio_set() with the idle
+    class on Linux. Failures are ignored so that a missing capability never
+    stops an organization run.
+
+    Returns:
+        bool: Whether the I/O priority was lowered (nice is always attempted)
+    """
+    try:
+        os.nice(10)
+    except (AttributeError, OSError):
+        pass
+
+    if not sys.platform.startswith("linux"):
+        return False
+
+    syscall_nr = IOPRIO_SET_SYSCALLS.get(os.uname().machine)
+    if syscall_nr is None:
+        return False
+
+    try:
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        # who=0 means the calling thread
+        ioprio = IOPRIO_CLASS_IDLE << IOPRIO_CLASS_SHIFT
+        return libc.syscall(syscall_nr, IOPRIO_WHO_PROCESS, 0, ioprio) == 0
+    except (OSError, AttributeError):
+        return False
+
+
+class IOThrottle:
+    def __init__(self, max_bandwidth=None, adaptive=False,
+                 latency_threshold=2.0, max_delay=0.5):
+        """
+        Initialize the IOThrottle.
+
+        Args:
+            max_bandwidth (int): Bytes per second allowed for reads and writes
+                combined, or None for no fixed limit
+            adaptive (bool): Back off when observed read latency rises
+            latency_threshold (float): Ratio over the baseline latency that
+                triggers backoff
+            max_delay (float): Upper bound in seconds for the backoff delay
+        """
+        self.max_bandwidth = max_bandwidth
+        self.adaptive = adaptive
+        self.latency_threshold = latency_threshold
+        self.max_delay = max_delay
+
+        # Token bucket holding at most one second worth of bytes
+        self.tokens = float(max_bandwidth or 0)
+        self.last_refill = time.monotonic()
+
+        self.seed_latencies = []  # First reads, used to seed the baseline
+        self.baseline_latency = None  # Slow-moving average of read latency
+        self.recent_latency = None  # Fast-moving average of read latency
+        self.delay = 0.0  # Current adaptive backoff delay per chunk
+
+        self.lock = threading.Lock()
+
+    def consume(self, nbytes):
+        """
+        Account for bytes read or written, sleeping as needed.
+
+        Args:
+            nbytes (int): Number of bytes transferred
+        """
+        wait = 0.0
+
+        with self.lock:
+            if self.max_bandwidth:
+                now = time.monotonic()
+                self.tokens = min(
+                    float(self.max_bandwidth),
+                    self.tokens + (now - self.last_refill) * self.max_bandwidth
+                )
+                self.last_refill = now
+                self.tokens -= nbytes
+                if self.tokens < 0:
+                    wait = -self.tokens / self.max_bandwidth
+            wait += self.delay
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def observe_read(self, seconds):
+        """
+        Record the latency of a single read and adjust the backoff delay.
+
+        Args:
+            seconds (float): Time the read took
+        """
+        if not self.adaptive:
+            return
+
+        with self.lock:
+            if self.baseline_latency is None:
+                # Seed from the median so one slow cold read does not skew it
+                self.seed_latencies.append(seconds)
+                if len(self.seed_latencies) < LATENCY_SEED_SAMPLES:
+                    return
+                self.seed_latencies.sort()
+                self.baseline_latency = self.seed_latencies[LATENCY_SEED_SAMPLES // 2]
+                self.recent_latency = self.baseline_latency
+                self.seed_latencies = []
+                return
+
+            self.recent_latency += (seconds - self.recent_latency) * 0.3
+            congested = self.recent_latency > self.baseline_latency * self.latency_threshold
+
+            # Freeze the baseline under contention so it is not absorbed as normal
+            if not congested:
+                self.baseline_latency += (seconds - self.baseline_latency) * 0.01
+
+            if congested:
+                # Multiplicative increase while the disk is struggling
+                self.delay = min(self.max_delay, max(self.delay * 2, 0.001))
+            elif self.delay:
+                # Recover gradually once latency is back to normal
+                self.delay = self.delay / 2 if self.delay > 0.001 else 0.0
+
+    def read(self, f, size):
+        """
+        Read from a file object under the throttle.
+
+        Args:
+            f: Binary file object
+            size (int): Maximum number of bytes to read
+
+        Returns:
+            bytes: Data read
+        """
+        start = time.monotonic()
+        chunk = f.read(size)
+        # The empty read at EOF says nothing about disk latency
+        if chunk:
+            self.observe_read(time.monotonic() - start)
+            self.consume(len(chunk))
+        return chunk
+
+    def copy_file(self, src, dst):
+        """
+        Copy a file under the throttle, preserving metadata like shutil.copy2.
+
+        Used as the copy function for shutil.move when a rename is not
+        possible (e.g. across filesystems).
+
+        Args:
+            src (str): Source path
+            dst (str): Destination path
+
+        Returns:
+            str: Destination path
+        """
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            chunk = self.read(fsrc, 65536)
+            while chunk:
+                fdst.write(chunk)
+                self.consume(len(chunk))
+                chunk = self.read(fsrc, 65536)
+
+        shutil.copystat(src, dst)
+        return dst